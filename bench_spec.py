@@ -0,0 +1,36 @@
+"""
+    Compares PyArgs.from_spec against building the same options one at a time with PyArgsOption(**kvargs).
+"""
+
+import timeit
+
+import pyargs
+
+
+def build_spec(count):
+    spec = []
+    for index in range(count):
+        option = {"longname": "option%d" % index, "description": "option number %d" % index}
+        if index % 3 == 0:
+            option["datatype"] = "int"
+        if index % 5 == 0:
+            option["allowedvalues"] = ["a", "b", "c"]
+        spec.append(option)
+    return spec
+
+
+def per_option(spec):
+    pyarg = pyargs.PyArgs()
+    for option in spec:
+        pyarg.add_option(pyargs.PyArgsOption(**option))
+    return pyarg
+
+
+if __name__ == "__main__":
+    spec = build_spec(10000)
+    repeat = 20
+    per_option_time = min(timeit.repeat(lambda: per_option(spec), number = 1, repeat = repeat))
+    from_spec_time = min(timeit.repeat(lambda: pyargs.PyArgs.from_spec(spec), number = 1, repeat = repeat))
+    print "options:     %d" % len(spec)
+    print "per option:  %.2f ms" % (per_option_time * 1000)
+    print "from_spec:   %.2f ms" % (from_spec_time * 1000)
@@ -12,14 +12,161 @@
         - boolean options
 """
 
+import itertools
 import json
+import keyword
+import operator
+import re
 
 import columnizer
 
 
+_result_classes = {}
+
+
+def _result_class_for(localnames):
+    # type: (tuple) -> type
+    """
+    Returns the PyArgsResult subclass for the given localnames, building and caching it on first use.
+    Each localname gets a slot named after it, with any '-' replaced by '_'.
+    """
+    result_class = _result_classes.get(localnames)
+    if result_class is None:
+        slots = []
+        for localname in localnames:
+            slot = localname.replace("-", "_") if isinstance(localname, basestring) else None
+            if slot is None or not re.match(r"[A-Za-z][A-Za-z0-9_]*\Z", slot) or keyword.iskeyword(slot) \
+                    or hasattr(PyArgsResult, slot) or slot in slots:
+                raise StandardError(
+                    "the localname '%s' is not a valid attribute name, set a localname to use a result class."
+                    % (localname,))
+            slots.append(slot)
+        result_class = type("PyArgsNamespace", (PyArgsResult,), {
+            "__slots__": tuple(slots),
+            "_localnames": localnames,
+            "_slotnames": dict(zip(localnames, slots))
+        })
+        _result_classes[localnames] = result_class
+    return result_class
+
+
+def _rebuild_result(localnames, values):
+    # type: (tuple, dict) -> PyArgsResult
+    return _result_class_for(localnames).from_dict(values)
+
+
+class PyArgsResult(object):
+    """
+    Base for the attribute-access result classes generated by PyArgs.result_class().
+    Each generated subclass has one slot per option localname, so no per-instance dict is kept.
+    Options that were not given and have no default are left unset.
+    """
+    __slots__ = ()
+    __hash__ = None
+    _localnames = ()
+    _slotnames = {}
+
+    @classmethod
+    def from_dict(cls, values):
+        # type: (dict) -> PyArgsResult
+        result = cls()
+        slotnames = cls._slotnames
+        for key in values:
+            setattr(result, slotnames[key], values[key])
+        return result
+
+    def as_dict(self):
+        # type: () -> dict
+        result = {}
+        for localname, slot in self._slotnames.iteritems():
+            try:
+                result[localname] = getattr(self, slot)
+            except AttributeError:
+                pass
+        return result
+
+    def __contains__(self, item):
+        slot = self._slotnames.get(item)
+        return slot is not None and hasattr(self, slot)
+
+    def __eq__(self, other):
+        if isinstance(other, PyArgsResult):
+            other = other.as_dict()
+        return self.as_dict() == other
+
+    def __ne__(self, other):
+        return not self.__eq__(other)
+
+    def __reduce__(self):
+        return _rebuild_result, (self._localnames, self.as_dict())
+
+    def __repr__(self):
+        return "%s(%s)" % (self.__class__.__name__, self.as_dict())
+
+
+class PyArgsRemainders(object):
+    """
+    Read only view of the trailing arguments that were not consumed by the parser.
+    The original args list is referenced, not copied.
+    """
+    __slots__ = ("_args", "_start")
+    __hash__ = None
+
+    def __init__(self, args, start):
+        self._args = args
+        self._start = start
+
+    def __len__(self):
+        return max(len(self._args) - self._start, 0)
+
+    def __getitem__(self, item):
+        length = len(self)
+        if isinstance(item, slice):
+            start, stop, step = item.indices(length)
+            if step == 1:
+                return self._args[self._start + start:self._start + max(stop, start)]
+            return [self._args[self._start + index] for index in xrange(start, stop, step)]
+        item = operator.index(item)
+        if item < 0:
+            item += length
+        if item < 0 or item >= length:
+            raise IndexError("remainders index out of range")
+        return self._args[self._start + item]
+
+    def __iter__(self):
+        for index in xrange(self._start, len(self._args)):
+            yield self._args[index]
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, PyArgsRemainders)):
+            return NotImplemented
+        if len(other) != len(self):
+            return False
+        for mine, theirs in itertools.izip(self, other):
+            if mine != theirs:
+                return False
+        return True
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        if result is NotImplemented:
+            return result
+        return not result
+
+    def tolist(self):
+        # type: () -> list
+        return self._args[self._start:]
+
+    def __repr__(self):
+        return repr(self.tolist())
+
+
 class PyArgs:
     def __init__(self):
         self.options = []
+        self._shortname_index = {}
+        self._longname_index = {}
+        self._indexed_count = 0
         return
 
     def print_menu(self):
@@ -38,21 +185,158 @@ class PyArgs:
         :type option: PyArgsOption
         """
         self.options.append(option)
+        self.index_options()
+
+    def index_options(self):
+        """
+        Brings the shortname and longname indexes used by find_option up to date with self.options.
+        Only options appended since the last call are indexed, the indexes are rebuilt if the list shrank.
+        Call this after replacing options in place.
+        """
+        if len(self.options) < self._indexed_count:
+            self._shortname_index = {}
+            self._longname_index = {}
+            self._indexed_count = 0
+        shortname_index = self._shortname_index
+        longname_index = self._longname_index
+        for opt in self.options[self._indexed_count:]:
+            values = opt.values
+            if values["shortname"] is not None:
+                shortname_index.setdefault(values["shortname"], opt)
+            if values["longname"] is not None:
+                longname_index.setdefault(values["longname"], opt)
+        self._indexed_count = len(self.options)
+
+    @classmethod
+    def from_spec(cls, spec):
+        # type: (list) -> PyArgs
+        """
+        Builds a PyArgs from a list of option dicts, in the same schema PyArgsOption.__repr__ emits.
+        Each entry is checked once with PyArgsOption.validate and every problem in the table is reported
+        in a single StandardError. Keys set to None are treated as not given.
+        On top of the PyArgsOption checks a spec requires string names, boolean hasvalue and islist, a list of
+        allowedvalues, and may not define the same shortname or longname twice. add_option does not check these.
+        """
+        if not isinstance(spec, list):
+            raise StandardError("invalid spec, must be a list of options but was %s" % type(spec).__name__)
+
+        validate = PyArgsOption.validate
+        build_values = PyArgsOption._build_values
+        new_option = PyArgsOption.__new__
+        errors = []
+        options = []
+        shortnames = set()
+        longnames = set()
+
+        for index, entry in enumerate(spec):
+            if not isinstance(entry, dict):
+                errors.append("option %d: must be an object but was %s" % (index, type(entry).__name__))
+                continue
+
+            # PyArgsOption treats a present allowedvalues or datatype as set, so null keys are dropped here.
+            if None in entry.viewvalues():
+                entry = dict((key, value) for key, value in entry.iteritems() if value is not None)
+
+            entry_errors = validate(entry)
+
+            shortname = entry.get("shortname")
+            if shortname is not None:
+                if not isinstance(shortname, basestring):
+                    entry_errors.append("shortname must be a string but was %r" % (shortname,))
+                elif shortname in shortnames:
+                    entry_errors.append("shortname '%s' is already defined" % shortname)
+                else:
+                    shortnames.add(shortname)
+
+            longname = entry.get("longname")
+            if longname is not None:
+                if not isinstance(longname, basestring):
+                    entry_errors.append("longname must be a string but was %r" % (longname,))
+                elif longname in longnames:
+                    entry_errors.append("longname '%s' is already defined" % longname)
+                else:
+                    longnames.add(longname)
+
+            localname = entry.get("localname")
+            if localname is not None and not isinstance(localname, basestring):
+                entry_errors.append("localname must be a string but was %r" % (localname,))
+
+            hasvalue = entry.get("hasvalue")
+            if hasvalue is not None and not isinstance(hasvalue, bool):
+                entry_errors.append("hasvalue must be true or false but was %r" % (hasvalue,))
+
+            islist = entry.get("islist")
+            if islist is not None and not isinstance(islist, bool):
+                entry_errors.append("islist must be true or false but was %r" % (islist,))
+
+            allowedvalues = entry.get("allowedvalues")
+            if allowedvalues is not None and not isinstance(allowedvalues, list):
+                entry_errors.append("allowedvalues must be a list but was %r" % (allowedvalues,))
+
+            if entry_errors:
+                errors.extend(["option %d: %s" % (index, message) for message in entry_errors])
+            elif not errors:
+                # the entry already passed validate, so build the option without running __init__ checks again.
+                option = new_option(PyArgsOption)
+                option.values = build_values(entry)
+                options.append(option)
+
+        if errors:
+            raise StandardError("invalid spec, %d errors:\n    %s" % (len(errors), "\n    ".join(errors)))
+
+        pyargs = cls()
+        pyargs.options = options
+        pyargs.index_options()
+        return pyargs
+
+    def result_class(self):
+        # type: () -> type
+        """
+        Returns the PyArgsResult subclass for the current set of options, with one slot per localname.
+        Hyphens in a localname become underscores in the attribute name, as_dict() uses the localnames.
+        Classes are cached by their localnames, so parsers with the same localnames share one class.
+        """
+        localnames = []
+        seen = set()
+        for opt in self.options:
+            if opt.localname not in seen:
+                seen.add(opt.localname)
+                localnames.append(opt.localname)
+        return _result_class_for(tuple(localnames))
 
     def find_option(self, shortname = None, longname = None):
         # type: (basestring , basestring) -> PyArgsOption
-        for opt in self.options:
-            if longname and shortname and opt.longname == longname and opt.shortname == shortname:
-                return opt
-            if shortname and opt.shortname == shortname:
-                return opt
-            if longname and opt.longname == longname:
-                return opt
-        return None
-
-    def parse(self, args):
-        # type: (list) -> (dict,list)
-        remainders = []
+        if self._indexed_count != len(self.options):
+            self.index_options()
+        short_opt = self._shortname_index.get(shortname) if shortname else None
+        long_opt = self._longname_index.get(longname) if longname else None
+        if short_opt is None:
+            return long_opt
+        if long_opt is None or long_opt is short_opt:
+            return short_opt
+        # both names matched, but different options, so return the one defined first.
+        if self.options.index(short_opt) < self.options.index(long_opt):
+            return short_opt
+        return long_opt
+
+    def parse(self, args, namespace = False):
+        # type: (list, bool) -> (dict,list) | (PyArgsResult,PyArgsRemainders)
+        """
+        Parses args and returns the found arguments along with the remaining unparsed args.
+        When namespace is set, the found arguments are returned as an instance of result_class()
+        and the remainders as a PyArgsRemainders view into args instead of a copied list.
+        """
+        if not namespace:
+            foundargs, remainders_index = self._parse(args)
+            return foundargs, args[remainders_index:]
+
+        result_class = self.result_class()
+        foundargs, remainders_index = self._parse(args)
+        return result_class.from_dict(foundargs), PyArgsRemainders(args, remainders_index)
+
+    def _parse(self, args):
+        # type: (list) -> (dict,int)
+        remainders_index = len(args)
         foundargs = {}
 
         # first do a generic processing of each of the arguments incoming.
@@ -114,7 +398,7 @@ class PyArgs:
                             processed_list.append({"name": argname})
             else:
                 if open_argument is None:
-                    remainders = args[index:]
+                    remainders_index = index
                     break
 
         for arg in processed_list:
@@ -208,57 +492,78 @@ class PyArgs:
             if opt.default and opt.localname not in foundargs:
                 foundargs[opt.localname] = opt.default
 
-        return foundargs, remainders
+        return foundargs, remainders_index
 
 
-class PyArgsOption:
+class PyArgsOption(object):
     validKeys = ["localname", "shortname", "longname", "hasvalue", "default", "callback", "allowedvalues",
                  "description", "datatype", "islist"]
+    validKeySet = frozenset(validKeys)
+    validDatatypes = ["float", "int", "boolean"]
+    defaultValues = {
+        "localname": None,
+        "hasvalue": False,
+        "shortname": None,
+        "longname": None,
+        "default": None,
+        "callback": None,
+        "allowedvalues": None,
+        "description": None,
+        "datatype": None,
+        "islist": False
+    }
 
     def __init__(self, *args, **kvargs):
-        self.values = {
-            "localname": None,
-            "hasvalue": False,
-            "shortname": None,
-            "longname": None,
-            "default": None,
-            "callback": None,
-            "allowedvalues": None,
-            "description": None,
-            "datatype": None,
-            "islist": False
-        }
-
         if len(args):
             raise StandardError("No standard arguments allowed.")
 
-        if len(kvargs.keys()) == 0:
-            raise StandardError("Empty named arguments not allowed")
+        errors = self.__class__.validate(kvargs)
+        if errors:
+            raise StandardError(errors[0])
 
-        if "shortname" not in kvargs.keys() and "longname" not in kvargs.keys():
-            raise StandardError("Must include either a shortname or a longname")
+        self.values = self.__class__._build_values(kvargs)
+        return
 
-        for key in kvargs:
-            if self.__class__.validKeys.count(key) == 0:
-                raise StandardError("Invalid key '%s'" % key)
-            self.values[key] = kvargs[key]
+    @classmethod
+    def validate(cls, kvargs):
+        # type: (dict) -> list
+        """
+        Returns the problems with the named arguments kvargs as a list of messages, empty when they are valid.
+        """
+        if len(kvargs) == 0:
+            return ["Empty named arguments not allowed"]
 
-        if self.values["localname"] is None:
-            localname = self.values["longname"]
-            if localname is None:
-                localname = self.values["shortname"]
-            self.values["localname"] = localname
+        errors = []
+        if "shortname" not in kvargs and "longname" not in kvargs:
+            errors.append("Must include either a shortname or a longname")
 
-        if self.values["datatype"] is not None:
-            valid_datatypes = ["float", "int", "boolean"]
-            if self.values["datatype"] not in valid_datatypes:
-                raise StandardError(
-                    "datatype must be one of: %s but was %s" % (valid_datatypes, self.values["datatype"]))
+        if not kvargs.viewkeys() <= cls.validKeySet:
+            for key in kvargs:
+                if key not in cls.validKeySet:
+                    errors.append("Invalid key '%s'" % key)
 
-        if kvargs.has_key("allowedvalues") or kvargs.has_key("datatype"):
-            self.values["hasvalue"] = True
+        datatype = kvargs.get("datatype")
+        if datatype is not None and (not isinstance(datatype, basestring) or datatype not in cls.validDatatypes):
+            errors.append("datatype must be one of: %s but was %s" % (cls.validDatatypes, datatype))
 
-        return
+        return errors
+
+    @classmethod
+    def _build_values(cls, kvargs):
+        # type: (dict) -> dict
+        values = dict(cls.defaultValues)
+        values.update(kvargs)
+
+        if values["localname"] is None:
+            localname = values["longname"]
+            if localname is None:
+                localname = values["shortname"]
+            values["localname"] = localname
+
+        if "allowedvalues" in kvargs or "datatype" in kvargs:
+            values["hasvalue"] = True
+
+        return values
 
     def menu_name(self):
         result = ""
@@ -283,6 +588,14 @@ class PyArgsOption:
         return self.values[item]
 
 
+def load_spec(fp):
+    # type: (file) -> PyArgs
+    """
+    Reads a JSON list of options from the file like object fp and builds a PyArgs with PyArgs.from_spec.
+    """
+    return PyArgs.from_spec(json.load(fp))
+
+
 if __name__ == "__main__":
     pyargs = PyArgs()
     pyargs.add_option(PyArgsOption(shortname = "a", longname = "address",
@@ -1,3 +1,5 @@
+import pickle
+from StringIO import StringIO
 from unittest import TestCase
 
 import pyargs
@@ -238,3 +240,150 @@ class TestPyArgs(TestCase):
         pyarg.add_option(pyargs.PyArgsOption(shortname = "a"))
         with self.assertRaises(StandardError):
             pyarg.parse(["-a", "-a"])
+
+    def test_should_parse_into_result_class(self):
+        pyarg = pyargs.PyArgs()
+        pyarg.add_option(pyargs.PyArgsOption(localname = "ppp", longname = "test1", hasvalue = True))
+        pyarg.add_option(pyargs.PyArgsOption(longname = "test2", hasvalue = True, default = "default2"))
+        pyarg.add_option(pyargs.PyArgsOption(longname = "test3", hasvalue = True))
+        pyarg.add_option(pyargs.PyArgsOption(shortname = "t", hasvalue = True, islist = True, datatype = "int"))
+        args = ["--test1=", "AVALUE", "-t5", "-t1", "remainders", "more"]
+        result, remainders = pyarg.parse(args, namespace = True)
+        self.assertIsInstance(result, pyargs.PyArgsResult)
+        self.assertEqual("AVALUE", result.ppp)
+        self.assertEqual("default2", result.test2)
+        self.assertEqual([5, 1], result.t)
+        self.assertFalse(hasattr(result, "__dict__"))
+        with self.assertRaises(AttributeError):
+            result.test3
+        self.assertEqual({"ppp": "AVALUE", "test2": "default2", "t": [5, 1]}, result.as_dict())
+        self.assertEqual(pyarg.parse(args)[0], result.as_dict())
+        self.assertEqual(["remainders", "more"], remainders)
+        self.assertEqual("more", remainders[-1])
+        self.assertEqual(["remainders", "more"], remainders.tolist())
+
+    def test_should_reuse_result_class_until_options_change(self):
+        pyarg = pyargs.PyArgs()
+        pyarg.add_option(pyargs.PyArgsOption(shortname = "a"))
+        result_class = pyarg.result_class()
+        self.assertIs(result_class, pyarg.result_class())
+        self.assertNotEqual("PyArgsResult", result_class.__name__)
+        pyarg.add_option(pyargs.PyArgsOption(shortname = "b"))
+        self.assertIsNot(result_class, pyarg.result_class())
+        self.assertEqual(("a", "b"), pyarg.result_class().__slots__)
+        pyarg.options.append(pyargs.PyArgsOption(shortname = "c"))
+        result, remainders = pyarg.parse(["-c"], namespace = True)
+        self.assertEqual({"c": None}, result.as_dict())
+
+    def test_should_map_hyphenated_localname_to_attribute(self):
+        pyarg = pyargs.PyArgs()
+        pyarg.add_option(pyargs.PyArgsOption(longname = "dry-run"))
+        result, remainders = pyarg.parse(["--dry-run"], namespace = True)
+        self.assertIsNone(result.dry_run)
+        self.assertIn("dry-run", result)
+        self.assertEqual({"dry-run": None}, result.as_dict())
+
+    def test_should_pickle_result(self):
+        pyarg = pyargs.PyArgs()
+        pyarg.add_option(pyargs.PyArgsOption(longname = "dry-run"))
+        pyarg.add_option(pyargs.PyArgsOption(shortname = "t", hasvalue = True, islist = True))
+        result, remainders = pyarg.parse(["-t1", "-t2"], namespace = True)
+        copy = pickle.loads(pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+        self.assertIs(type(result), type(copy))
+        self.assertEqual(result, copy)
+        self.assertFalse(hasattr(copy, "dry_run"))
+
+    def test_should_compare_remainders_only_with_lists(self):
+        pyarg = pyargs.PyArgs()
+        pyarg.add_option(pyargs.PyArgsOption(shortname = "a"))
+        result, remainders = pyarg.parse(["-a", "yy", "zz"], namespace = True)
+        self.assertEqual(["yy", "zz"], remainders)
+        self.assertEqual(remainders, pyarg.parse(["yy", "zz"], namespace = True)[1])
+        self.assertNotEqual(("yy", "zz"), remainders)
+        with self.assertRaises(TypeError):
+            hash(remainders)
+        with self.assertRaises(TypeError):
+            hash(result)
+
+    def test_should_return_empty_remainders_view(self):
+        pyarg = pyargs.PyArgs()
+        pyarg.add_option(pyargs.PyArgsOption(shortname = "a"))
+        result, remainders = pyarg.parse(["-a"], namespace = True)
+        self.assertEqual(0, len(remainders))
+        self.assertEqual([], remainders)
+
+    def test_should_not_build_result_class_for_invalid_localname(self):
+        for localname in ["dry.run", "2fast", "name\n"]:
+            pyarg = pyargs.PyArgs()
+            pyarg.add_option(pyargs.PyArgsOption(longname = localname))
+            with self.assertRaises(StandardError):
+                pyarg.result_class()
+
+    def test_should_not_build_result_class_for_reserved_localname(self):
+        for localname in ["as_dict", "__dict__", "_private"]:
+            pyarg = pyargs.PyArgs()
+            pyarg.add_option(pyargs.PyArgsOption(longname = localname, hasvalue = True))
+            with self.assertRaises(StandardError):
+                pyarg.parse(["--%s=x" % localname], namespace = True)
+
+    def test_should_slice_remainders_view(self):
+        pyarg = pyargs.PyArgs()
+        pyarg.add_option(pyargs.PyArgsOption(shortname = "a"))
+        result, remainders = pyarg.parse(["-a", "r0", "r1", "r2", "r3"], namespace = True)
+        self.assertEqual(["r1", "r2"], remainders[1:3])
+        self.assertEqual(["r3", "r1"], remainders[::-2])
+        self.assertEqual([], remainders[3:1])
+        with self.assertRaises(TypeError):
+            remainders["0"]
+
+
+class TestPyArgsSpec(TestCase):
+    def test_should_load_options_from_repr(self):
+        options = [
+            pyargs.PyArgsOption(shortname = "a", longname = "address", description = "address"),
+            pyargs.PyArgsOption(shortname = "t", datatype = "int", islist = True),
+            pyargs.PyArgsOption(longname = "blood", allowedvalues = ["a", "b"], default = "a")
+        ]
+        spec = StringIO("[%s]" % ", ".join(repr(opt) for opt in options))
+        pyarg = pyargs.load_spec(spec)
+        self.assertEqual([opt.values for opt in options], [opt.values for opt in pyarg.options])
+        foundargs, remainders = pyarg.parse(["-a", "-t1", "-t2", "--blood=b", "remainders"])
+        self.assertEqual({"address": None, "t": [1, 2], "blood": "b"}, foundargs)
+        self.assertEqual(["remainders"], remainders)
+
+    def test_should_treat_null_values_as_not_given(self):
+        pyarg = pyargs.PyArgs.from_spec([{"shortname": "a", "datatype": None, "allowedvalues": None}])
+        self.assertFalse(pyarg.find_option(shortname = "a").hasvalue)
+
+    def test_should_report_every_spec_error(self):
+        with self.assertRaises(StandardError) as context:
+            pyargs.PyArgs.from_spec([
+                {"shortname": "a", "unknown": 1},
+                {"description": "no name"},
+                {"shortname": "b", "datatype": "X"},
+                {"shortname": "a"},
+                "not an option",
+                {"shortname": ["a"]},
+                {"longname": "list", "localname": 1},
+                {"shortname": "c", "hasvalue": "yes", "islist": 3, "allowedvalues": "abc"},
+                {"shortname": "d", "datatype": ["int"]}
+            ])
+        message = str(context.exception)
+        self.assertIn("11 errors", message)
+        for index in range(9):
+            self.assertIn("option %d:" % index, message)
+
+    def test_should_only_load_list_specs(self):
+        with self.assertRaises(StandardError) as context:
+            pyargs.load_spec(StringIO('{"options": []}'))
+        self.assertIn("must be a list", str(context.exception))
+
+    def test_should_find_options_from_spec_indexes(self):
+        pyarg = pyargs.PyArgs.from_spec([{"shortname": "o%d" % index, "longname": "option%d" % index}
+                                         for index in range(100)])
+        self.assertIs(pyarg.options[42], pyarg.find_option(shortname = "o42"))
+        self.assertIs(pyarg.options[42], pyarg.find_option(longname = "option42"))
+        self.assertIs(pyarg.options[3], pyarg.find_option(shortname = "o3", longname = "option42"))
+        self.assertIsNone(pyarg.find_option(longname = "option100"))
+        pyarg.options.append(pyargs.PyArgsOption(longname = "option100"))
+        self.assertIs(pyarg.options[100], pyarg.find_option(longname = "option100"))